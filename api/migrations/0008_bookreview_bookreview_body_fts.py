@@ -0,0 +1,19 @@
+# Generated by Django 4.0 on 2026-10-15 12:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_book_favorited_by'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('body', config='english'), name='bookreview_body_fts'),
+        ),
+    ]
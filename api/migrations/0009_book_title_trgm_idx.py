@@ -0,0 +1,21 @@
+# Generated by Django 4.0 on 2026-10-15 12:00
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_bookreview_bookreview_body_fts'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # title__icontains compiles to UPPER("title"::text) LIKE UPPER(...),
+        # so the index has to be on the same expression to be used
+        migrations.RunSQL(
+            sql='CREATE INDEX book_title_trgm_idx ON api_book USING GIN (UPPER(title) gin_trgm_ops);',
+            reverse_sql='DROP INDEX IF EXISTS book_title_trgm_idx;',
+        ),
+    ]
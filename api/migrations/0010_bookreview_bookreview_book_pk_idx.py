@@ -0,0 +1,17 @@
+# Generated by Django 4.0 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_book_title_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(fields=['book', 'id'], name='bookreview_book_pk_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.0 on 2026-10-15 12:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_bookreview_bookreview_book_pk_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bookreview',
+            name='bookreview_body_fts',
+        ),
+        migrations.AddField(
+            model_name='bookreview',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='bookreview_search_vector_idx'),
+        ),
+        # keep search_vector in sync with body on every insert and update
+        migrations.RunSQL(
+            sql="""
+            CREATE TRIGGER bookreview_search_vector_update
+            BEFORE INSERT OR UPDATE OF body ON api_bookreview
+            FOR EACH ROW EXECUTE FUNCTION
+            tsvector_update_trigger(search_vector, 'pg_catalog.english', body);
+            """,
+            reverse_sql='DROP TRIGGER IF EXISTS bookreview_search_vector_update ON api_bookreview;',
+        ),
+        # fill in search_vector for the reviews that already exist
+        migrations.RunSQL(
+            sql="UPDATE api_bookreview SET search_vector = to_tsvector('pg_catalog.english', body);",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,6 +1,8 @@
 import datetime
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db.models.constraints import UniqueConstraint
 from django.core.validators import MaxValueValidator, MinValueValidator
 
@@ -78,11 +80,18 @@ class BookReview(models.Model):
     reviewed_by = models.ForeignKey(
         to="User", on_delete=models.SET_NULL, blank=True, null=True
     )
+    # kept up to date from body by the bookreview_search_vector_update trigger
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         constraints = [
             UniqueConstraint(fields=["reviewed_by", "book"], name="unique_user_review")
         ]
+        indexes = [
+            # the reviews list filters by book and pages through them by pk
+            models.Index(fields=["book", "id"], name="bookreview_book_pk_idx"),
+            GinIndex(fields=["search_vector"], name="bookreview_search_vector_idx"),
+        ]
 
     def __repr__(self):
         return (
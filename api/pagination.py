@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class BookCursorPagination(CursorPagination):
+    page_size = 50
+    ordering = "title"
+
+
+class BookReviewCursorPagination(CursorPagination):
+    page_size = 50
+    ordering = "-pk"
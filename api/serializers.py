@@ -1,10 +1,32 @@
+from copy import copy
 from rest_framework.serializers import ValidationError
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from rest_framework.validators import UniqueTogetherValidator
 from .models import Book, BookRecord, BookReview, User
 
 
-class BookSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Build a serializer class's fields once and hand each new instance shallow
+    copies of them, instead of introspecting the model and deep copying the
+    declared fields every time a serializer is instantiated.
+    """
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        cached = self._fields_cache.get(cls)
+        if cached is None:
+            cached = super().get_fields()
+            self._fields_cache[cls] = cached
+        # shallow copies are enough here; none of the serializers that use this
+        # declare many=True related fields, whose child field would be shared
+        return {field_name: copy(field) for field_name, field in cached.items()}
+
+
+class BookSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = (
@@ -17,10 +39,18 @@ class BookSerializer(serializers.ModelSerializer):
         )
 
 
-class BookDetailSerializer(serializers.ModelSerializer):
-    reviews = serializers.HyperlinkedRelatedField(
-        many=True, read_only=True, view_name="book_review_detail"
-    )
+class BookListSerializer(CachedFieldsMixin, serializers.Serializer):
+    # a plain serializer for lists of books that come from .values() dicts
+    pk = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    author = serializers.CharField(read_only=True)
+    publication_year = serializers.IntegerField(read_only=True)
+    featured = serializers.BooleanField(read_only=True)
+    favorite_count = serializers.IntegerField(read_only=True)
+
+
+class BookDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    reviews = serializers.SerializerMethodField()
 
     class Meta:
         model = Book
@@ -34,17 +64,46 @@ class BookDetailSerializer(serializers.ModelSerializer):
             "favorite_count",
         )
 
+    def get_reviews(self, obj):
+        # reverse() is slow, so work out the review url prefix once and reuse
+        # it for every review
+        review_url = reverse(
+            "book_review_detail", kwargs={"pk": 0}, request=self.context["request"]
+        )
+        review_url_prefix = review_url.removesuffix("0")
+        # BookViewSet annotates books with their review pks; fall back to
+        # querying the reviews for books that didn't come from there
+        review_pks = getattr(obj, "review_pks", None)
+        if review_pks is None:
+            review_pks = [review.pk for review in obj.reviews.all()]
+        return [f"{review_url_prefix}{pk}" for pk in review_pks]
+
 
-class BookRecordSerializer(serializers.ModelSerializer):
-    book = BookSerializer(read_only=True)
+class BookRecordSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    # flat fields instead of a nested BookSerializer, so each record doesn't
+    # need its own nested serializer
+    book_pk = serializers.IntegerField(source="book.pk", read_only=True)
+    book_title = serializers.CharField(source="book.title", read_only=True)
+    book_author = serializers.CharField(source="book.author", read_only=True)
+    book_year = serializers.IntegerField(source="book.publication_year", read_only=True)
+    book_featured = serializers.BooleanField(source="book.featured", read_only=True)
     reader = serializers.SlugRelatedField(read_only=True, slug_field="username")
 
     class Meta:
         model = BookRecord
-        fields = ("pk", "book", "reader", "reading_state")
+        fields = (
+            "pk",
+            "book_pk",
+            "book_title",
+            "book_author",
+            "book_year",
+            "book_featured",
+            "reader",
+            "reading_state",
+        )
 
 
-class BookReviewSerializer(serializers.ModelSerializer):
+class BookReviewSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     book = serializers.SlugRelatedField(read_only=True, slug_field="title")
     reviewed_by = serializers.SlugRelatedField(read_only=True, slug_field="username")
 
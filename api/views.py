@@ -1,10 +1,12 @@
+from functools import lru_cache
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.search import SearchQuery
 from django.db import IntegrityError
-from django.views.defaults import bad_request
-from psycopg2.errors import UniqueViolation
+from django.db.models import Count, Q
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action, permission_classes
-from rest_framework.exceptions import PermissionDenied, ParseError
+from rest_framework.exceptions import NotFound, PermissionDenied, ParseError
 from rest_framework.views import APIView
 from rest_framework.generics import (
     ListCreateAPIView,
@@ -17,6 +19,7 @@ from .models import Book, BookRecord, BookReview
 from .serializers import (
     BookSerializer,
     BookDetailSerializer,
+    BookListSerializer,
     BookRecordSerializer,
     BookReviewSerializer,
 )
@@ -24,31 +27,59 @@ from .custom_permissions import (
     IsAdminOrReadOnly,
     IsReaderOrReadOnly,
 )
-from api import serializers
-from django.db.models import Count
+from .pagination import BookCursorPagination, BookReviewCursorPagination
+
+# the columns BookSerializer needs (the pk is always loaded)
+BOOK_LIST_FIELDS = ("title", "author", "publication_year", "featured")
+
+
+@lru_cache(maxsize=1024)
+def compiled_search_query(search_term):
+    # popular searches reuse the same SearchQuery instead of building a new one
+    return SearchQuery(search_term, config="english")
+
+
+def book_list_values(queryset):
+    # lists only need a few columns, so skip building Book instances and
+    # count each book's favorites in the same query
+    return queryset.annotate(favorite_count=Count("favorited_by")).values(
+        "pk", *BOOK_LIST_FIELDS, "favorite_count"
+    )
 
 
 class BookViewSet(ModelViewSet):
     queryset = Book.objects.all().order_by("title")
     serializer_class = BookDetailSerializer
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    pagination_class = BookCursorPagination
 
     def get_serializer_class(self):
-        if self.action in ["list"]:
-            return BookSerializer
+        if self.action in ["list", "featured", "favorites"]:
+            return BookListSerializer
         return super().get_serializer_class()
 
     def get_queryset(self):
         # if there are query params, and there is a key for "search", use that search term to filter the queryset
         search_term = self.request.query_params.get("search")
         if search_term is not None:
-            results = Book.objects.filter(
-                title__icontains=self.request.query_params.get("search")
+            results = Book.objects.filter(title__icontains=search_term).order_by(
+                "title"
             )
         else:
             # if there is no query param, use the default queryset
             results = super().get_queryset()
-        return results
+        if self.action == "list":
+            return book_list_values(results)
+        # the serializer only needs the pk of each review to build its url, so
+        # collect them into an array in the same query as the book
+        return results.annotate(
+            review_pks=ArrayAgg(
+                "reviews__pk",
+                filter=Q(reviews__isnull=False),
+                ordering="reviews__pk",
+                default=[],
+            )
+        )
 
     def create(self, request, *args, **kwargs):
         try:
@@ -61,13 +92,17 @@ class BookViewSet(ModelViewSet):
 
     @action(detail=False)
     def featured(self, request):
-        featured_books = Book.objects.filter(featured=True)
+        featured_books = book_list_values(Book.objects.filter(featured=True))
         serializer = self.get_serializer(featured_books, many=True)
         return Response(serializer.data)
 
     @action(detail=False)
     def favorites(self, request):
-        favorited_books = request.user.favorite_books.all()
+        # filter with a subquery so the favorite count doesn't reuse the join
+        # on favorited_by that picks out this user's favorites
+        favorited_books = book_list_values(
+            Book.objects.filter(pk__in=request.user.favorite_books.values("pk"))
+        )
         serializer = self.get_serializer(favorited_books, many=True)
         return Response(serializer.data)
 
@@ -78,16 +113,39 @@ class BookRecordViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated, IsReaderOrReadOnly]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # join the book and reader into the same query and only load the
+        # columns the serializer needs (plus updated_at, so that saving a
+        # record from this queryset still updates its timestamp)
+        queryset = (
+            super()
+            .get_queryset()
+            .select_related("book", "reader")
+            .only(
+                "reading_state",
+                "updated_at",
+                "book__title",
+                "book__author",
+                "book__publication_year",
+                "book__featured",
+                "reader__username",
+            )
+        )
         return queryset.filter(reader=self.request.user, book=self.kwargs["book_pk"])
 
     def create(self, request, *args, **kwargs):
+        error_data = {
+            "error": "Unique constraint violation: this user has already created a book record for this book."
+        }
+        # check for an existing record up front instead of waiting for the
+        # insert to fail; the IntegrityError is still caught in case another
+        # request creates the same record in between
+        if BookRecord.objects.filter(
+            reader=request.user, book_id=self.kwargs["book_pk"]
+        ).exists():
+            return Response(error_data, status=400)
         try:
             return super().create(request, *args, **kwargs)
         except IntegrityError:
-            error_data = {
-                "error": "Unique constraint violation: this user has already created a book record for this book."
-            }
             return Response(error_data, status=400)
 
     def perform_create(self, serializer):
@@ -95,21 +153,35 @@ class BookRecordViewSet(ModelViewSet):
         serializer.save(reader=self.request.user, book=book)
 
 
+def reviews_with_book_and_reviewer():
+    # join the book and reviewer so the slug fields don't need a query per review
+    return BookReview.objects.select_related("book", "reviewed_by").only(
+        "body", "book__title", "reviewed_by__username"
+    )
+
+
 class BookReviewDetailView(RetrieveDestroyAPIView):
     serializer_class = BookReviewSerializer
     queryset = BookReview.objects.all()
 
+    def get_queryset(self):
+        return reviews_with_book_and_reviewer()
+
 
 class BookReviewListCreateView(ListCreateAPIView):
     serializer_class = BookReviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = BookReviewCursorPagination
 
     def get_queryset(self):
-        queryset = BookReview.objects.filter(book_id=self.kwargs["book_pk"])
+        queryset = reviews_with_book_and_reviewer().filter(
+            book_id=self.kwargs["book_pk"]
+        )
         search_term = self.request.query_params.get("search")
         if search_term is not None:
-            ## this is using the search method for postgres full-text search
-            queryset = queryset.filter(body__search=search_term)
+            ## this is using postgres full-text search against the search_vector
+            ## column, which a database trigger keeps up to date with the body
+            queryset = queryset.filter(search_vector=compiled_search_query(search_term))
         return queryset
 
     def perform_create(self, serializer, **kwargs):
@@ -123,11 +195,16 @@ class CreateFavoriteView(APIView):
     def post(self, request, **kwargs):
         # I need to know the user
         user = self.request.user
-        # I need to know the book
-        book = get_object_or_404(Book, pk=self.kwargs["book_pk"])
+        # I need to know the book (add() takes a pk, so it doesn't need fetching)
+        book_pk = self.kwargs["book_pk"]
         # I need to add the book to the user's favorites
-        user.favorite_books.add(book)
+        try:
+            user.favorite_books.add(book_pk)
+        except IntegrityError:
+            # the foreign key to the book fails if there is no book with this pk
+            raise NotFound()
         # use a serializer to serialize data about the book we just favorited
-        serializer = BookDetailSerializer(book, context={"request": request})
+        book = get_object_or_404(Book.objects.only(*BOOK_LIST_FIELDS), pk=book_pk)
+        serializer = BookSerializer(book, context={"request": request})
         # return a response
         return Response(serializer.data, status=201)
@@ -17,6 +17,7 @@ env = environ.Env(
     # set casting, default value
     DEBUG=(bool, False),
     USE_EMAIL=(bool, False),
+    CONN_MAX_AGE=(int, 600),
 )
 environ.Env.read_env()
 
@@ -141,6 +142,8 @@ import django_on_heroku
 
 django_on_heroku.settings(locals())
 del DATABASES["default"]["OPTIONS"]["sslmode"]
+# keep database connections open between requests instead of reconnecting each time
+DATABASES["default"]["CONN_MAX_AGE"] = env("CONN_MAX_AGE")
 
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [